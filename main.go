@@ -4,9 +4,6 @@ import (
 	"context"
 	"fmt"
 	"os"
-	"os/exec"
-	"runtime"
-	"strings"
 	"syscall"
 	"time"
 
@@ -15,107 +12,42 @@ import (
 	"golang.org/x/term"
 )
 
-// findVPNExec attempts to locate the Cisco Secure Client VPN executable
-// depending on the OS. Falls back to PATH lookup if unknown.
-func findVPNExec() (string, error) {
-	osType := runtime.GOOS
-	var candidates []string
-
-	switch osType {
-	case "darwin": // macOS
-		candidates = []string{
-			"/opt/cisco/secureclient/bin/vpn",
-			"/Applications/Cisco/Cisco Secure Client.app/Contents/MacOS/vpn",
-			"/Applications/Cisco AnyConnect Secure Mobility Client.app/Contents/MacOS/vpn",
-		}
-	case "linux":
-		candidates = []string{
-			"/opt/cisco/secureclient/bin/vpn",
-			"/opt/cisco/anyconnect/bin/vpn",
-			"/usr/local/bin/vpn",
-			"/usr/bin/vpn",
-		}
-	case "windows":
-		candidates = []string{
-			`C:\Program Files (x86)\Cisco\Cisco Secure Client\vpncli.exe`,
-			`C:\Program Files (x86)\Cisco\Cisco AnyConnect Secure Mobility Client\vpncli.exe`,
-			`C:\Program Files\Cisco\Cisco Secure Client\vpncli.exe`,
-			`C:\Program Files\Cisco\Cisco AnyConnect Secure Mobility Client\vpncli.exe`,
-		}
-	}
-
-	// Check each candidate
-	for _, path := range candidates {
-		if fileExists(path) && isExecutable(path) {
-			return path, nil
-		}
-	}
-
-	// Fallback: try PATH lookup
-	vpnExecs := []string{"vpn", "vpncli"}
-	for _, execName := range vpnExecs {
-		if path, err := exec.LookPath(execName); err == nil {
-			return path, nil
-		}
-	}
-
-	return "", fmt.Errorf("could not locate Cisco Secure Client/AnyConnect executable")
-}
-
-// fileExists checks if a file exists
-func fileExists(path string) bool {
-	_, err := os.Stat(path)
-	return err == nil
-}
-
-// isExecutable checks if a file is executable
-func isExecutable(path string) bool {
-	info, err := os.Stat(path)
-	if err != nil {
-		return false
-	}
-	return info.Mode()&0111 != 0
-}
-
-// runCommand executes a command and returns its output
-func runCommand(name string, args ...string) (string, error) {
-	cmd := exec.Command(name, args...)
-	output, err := cmd.Output()
-	if err != nil {
-		return "", err
-	}
-	return strings.TrimSpace(string(output)), nil
-}
-
-// vpnConnected checks if VPN is currently connected
-func vpnConnected(vpnExec string) bool {
-	output, err := runCommand(vpnExec, "status")
-	if err != nil {
-		return false
-	}
-	return strings.Contains(output, "Connected")
+// newSpinner starts a progress spinner showing the given message
+func newSpinner(message string) *spinner.Spinner {
+	s := spinner.New(spinner.CharSets[14], 100*time.Millisecond)
+	s.Suffix = " " + message
+	s.Start()
+	return s
 }
 
-// getPassword prompts for password input without echoing
-func getPassword(prompt string) (string, error) {
+// getPassword prompts for password input without echoing. The password is
+// returned as bytes so callers can zero it once it has been used.
+func getPassword(prompt string) ([]byte, error) {
 	fmt.Print(prompt)
 	password, err := term.ReadPassword(int(syscall.Stdin))
 	fmt.Println() // Add newline after password input
 	if err != nil {
-		return "", err
+		return nil, err
 	}
-	return string(password), nil
+	return password, nil
 }
 
 // connectVPN connects to the VPN
 func connectVPN(vpnExec, host, username, method string, verbose bool) error {
-	// Start spinner for connection process
-	s := spinner.New(spinner.CharSets[14], 100*time.Millisecond)
-	s.Suffix = " Checking VPN Status..."
-	s.Start()
+	s := newSpinner("Checking VPN Status...")
 	defer s.Stop()
 
-	if vpnConnected(vpnExec) {
+	if verbose {
+		s.Stop() // Stop spinner if verbose mode to show VPN output
+	}
+
+	session, connected, err := openVPNSession(vpnExec, verbose)
+	if err != nil {
+		return fmt.Errorf("failed to start VPN session: %v", err)
+	}
+	defer session.close()
+
+	if connected {
 		return fmt.Errorf("VPN is already connected")
 	}
 
@@ -127,30 +59,28 @@ func connectVPN(vpnExec, host, username, method string, verbose bool) error {
 	}
 
 	// FIXME: this text is interrupted by the Duo (push/sms/phone): thing
-	// s = spinner.New(spinner.CharSets[14], 100*time.Millisecond)
-	// s.Suffix = " Connecting to VPN..."
-	// s.Start()
+	// s = newSpinner("Connecting to VPN...")
 	// defer s.Stop()
 
-	// Create the script for VPN connection like Python version
-	script := fmt.Sprintf("connect %s\n%s\n%s\n%s\ny\nexit\n", host, username, password, method)
-
-	cmd := exec.Command(vpnExec, "-s")
-	cmd.Stdin = strings.NewReader(script)
-
-	if verbose {
-		// s.Stop() // Stop spinner if verbose mode to show VPN output
-		cmd.Stdout = os.Stdout
-		cmd.Stderr = os.Stderr
-	}
-
-	err = cmd.Run()
+	// Answer the connect prompts (username, password, second factor, banner).
+	// The password is written on its own so it is never copied into a string.
+	output, err := session.finish(
+		[]byte("connect "+host+"\n"+username+"\n"),
+		password,
+		[]byte("\n"+method+"\ny\n"),
+	)
+	clear(password)
 	if err != nil {
 		return fmt.Errorf("VPN command failed: %v", err)
 	}
 
-	// Check if connection was successful
-	if !vpnConnected(vpnExec) {
+	// Check if connection was successful using the session's own output,
+	// only spawning `vpn status` if the session reported no state at all
+	state := lastState(output)
+	if state == "" && vpnConnected(vpnExec) {
+		state = "Connected"
+	}
+	if state != "Connected" {
 		return fmt.Errorf("VPN connection failed")
 	}
 
@@ -159,43 +89,42 @@ func connectVPN(vpnExec, host, username, method string, verbose bool) error {
 
 // disconnectVPN disconnects from the VPN
 func disconnectVPN(vpnExec string, verbose bool) error {
-
-	// FIXME: this code is duplicated
-	// Start spinner for connection process
-	s := spinner.New(spinner.CharSets[14], 100*time.Millisecond)
-	s.Suffix = " Checking VPN Status..."
-	s.Start()
+	s := newSpinner("Checking VPN Status...")
 	defer s.Stop()
 
-	if !vpnConnected(vpnExec) {
-		return fmt.Errorf("VPN is not connected.")
+	if verbose {
+		s.Stop() // Stop spinner if verbose mode to show VPN output
 	}
 
-	s.Stop()
+	session, connected, err := openVPNSession(vpnExec, verbose)
+	if err != nil {
+		return fmt.Errorf("failed to start VPN session: %v", err)
+	}
+	defer session.close()
 
-	// Start spinner for connection process
-	s = spinner.New(spinner.CharSets[14], 100*time.Millisecond)
-	s.Suffix = " Disconnecting from VPN..."
-	s.Start()
-	defer s.Stop()
+	if !connected {
+		return fmt.Errorf("VPN is not connected.")
+	}
 
-	script := "disconnect\nexit\n"
-	cmd := exec.Command(vpnExec, "-s")
-	cmd.Stdin = strings.NewReader(script)
+	s.Stop()
 
-	if verbose {
-		s.Stop() // Stop spinner if verbose mode to show VPN output
-		cmd.Stdout = os.Stdout
-		cmd.Stderr = os.Stderr
+	if !verbose {
+		s = newSpinner("Disconnecting from VPN...")
+		defer s.Stop()
 	}
 
-	err := cmd.Run()
+	output, err := session.finish([]byte("disconnect\n"))
 	if err != nil {
 		return fmt.Errorf("VPN disconnect command failed: %v", err)
 	}
 
-	// Check if disconnection was successful
-	if vpnConnected(vpnExec) {
+	// Check if disconnection was successful using the session's own output,
+	// only spawning `vpn status` if the session reported no state at all
+	state := lastState(output)
+	if state == "" && !vpnConnected(vpnExec) {
+		state = "Disconnected"
+	}
+	if state != "Disconnected" {
 		return fmt.Errorf("VPN disconnection failed")
 	}
 
@@ -264,11 +193,7 @@ func statusAction(ctx context.Context, cmd *cli.Command) error {
 		return err
 	}
 
-	// FIXME: this code is duplicated
-	// Start spinner for connection process
-	s := spinner.New(spinner.CharSets[14], 100*time.Millisecond)
-	s.Suffix = " Checking VPN Status..."
-	s.Start()
+	s := newSpinner("Checking VPN Status...")
 	defer s.Stop()
 
 	connected := vpnConnected(vpnExec)
@@ -0,0 +1,346 @@
+package main
+
+import (
+	"bufio"
+	"fmt"
+	"io"
+	"os"
+	"os/exec"
+	"runtime"
+	"strings"
+	"time"
+)
+
+// vpnCandidates lists known Cisco Secure Client/AnyConnect executable
+// locations, keyed by runtime.GOOS
+var vpnCandidates = map[string][]string{
+	"darwin": { // macOS
+		"/opt/cisco/secureclient/bin/vpn",
+		"/Applications/Cisco/Cisco Secure Client.app/Contents/MacOS/vpn",
+		"/Applications/Cisco AnyConnect Secure Mobility Client.app/Contents/MacOS/vpn",
+	},
+	"linux": {
+		"/opt/cisco/secureclient/bin/vpn",
+		"/opt/cisco/anyconnect/bin/vpn",
+		"/usr/local/bin/vpn",
+		"/usr/bin/vpn",
+	},
+	"windows": {
+		`C:\Program Files (x86)\Cisco\Cisco Secure Client\vpncli.exe`,
+		`C:\Program Files (x86)\Cisco\Cisco AnyConnect Secure Mobility Client\vpncli.exe`,
+		`C:\Program Files\Cisco\Cisco Secure Client\vpncli.exe`,
+		`C:\Program Files\Cisco\Cisco AnyConnect Secure Mobility Client\vpncli.exe`,
+	},
+}
+
+// findVPNExec attempts to locate the Cisco Secure Client VPN executable
+// depending on the OS. Falls back to PATH lookup if unknown.
+func findVPNExec() (string, error) {
+	// Check each candidate
+	for _, path := range vpnCandidates[runtime.GOOS] {
+		if isExecutable(path) {
+			return path, nil
+		}
+	}
+
+	// Fallback: try PATH lookup
+	vpnExecs := []string{"vpn", "vpncli"}
+	for _, execName := range vpnExecs {
+		if path, err := exec.LookPath(execName); err == nil {
+			return path, nil
+		}
+	}
+
+	return "", fmt.Errorf("could not locate Cisco Secure Client/AnyConnect executable")
+}
+
+// isExecutable checks if path is an existing, executable regular file using
+// a single stat call
+func isExecutable(path string) bool {
+	info, err := os.Stat(path)
+	if err != nil || !info.Mode().IsRegular() {
+		return false
+	}
+	// Windows has no executable permission bits, so existence is enough
+	if runtime.GOOS == "windows" {
+		return true
+	}
+	return info.Mode()&0111 != 0
+}
+
+// vpnStateTracker follows the VPN tool's output line by line. State lines
+// printed before the tool has registered with the local VPN subsystem are
+// not authoritative, so only states reported after registration are
+// recorded as current.
+type vpnStateTracker struct {
+	registered bool
+	last       string // last state reported, authoritative or not
+	current    string // last state reported after registration
+}
+
+// observe processes one line of output and returns the state it reported,
+// if any, and whether that state is authoritative
+func (t *vpnStateTracker) observe(line string) (string, bool) {
+	if strings.Contains(line, "registered with local VPN subsystem") {
+		t.registered = true
+		return "", false
+	}
+	_, value, found := strings.Cut(line, "state:")
+	if !found {
+		return "", false
+	}
+	t.last = strings.TrimSpace(value)
+	if t.registered {
+		t.current = t.last
+	}
+	return t.last, t.registered
+}
+
+// vpnConnected checks if VPN is currently connected. The first authoritative
+// state is used and the VPN tool is stopped right away instead of waiting for
+// the rest of its status output. Otherwise the last reported state is used,
+// provided the tool exits successfully.
+func vpnConnected(vpnExec string) bool {
+	cmd := exec.Command(vpnExec, "status")
+	stdout, err := cmd.StdoutPipe()
+	if err != nil {
+		return false
+	}
+	if err := cmd.Start(); err != nil {
+		return false
+	}
+
+	var tracker vpnStateTracker
+	scanner := bufio.NewScanner(stdout)
+	for scanner.Scan() {
+		if state, authoritative := tracker.observe(scanner.Text()); authoritative {
+			// The exit status is meaningless once the tool is killed
+			cmd.Process.Kill()
+			cmd.Wait()
+			return state == "Connected"
+		}
+	}
+
+	if err := cmd.Wait(); err != nil {
+		return false
+	}
+	return tracker.last == "Connected"
+}
+
+// lastState returns the most recent ">> state: ..." value reported in the
+// output of a VPN session, or an empty string if none was reported
+func lastState(output string) string {
+	state := ""
+	for _, line := range strings.Split(output, "\n") {
+		if _, value, found := strings.Cut(line, "state:"); found {
+			state = strings.TrimSpace(value)
+		}
+	}
+	return state
+}
+
+// vpnPrompt is printed by the VPN tool in interactive mode whenever it is
+// ready for the next command
+const vpnPrompt = "VPN> "
+
+// vpnPromptTimeout bounds how long to wait for vpnPrompt before giving up on
+// the session, so an unexpected prompt can't hang the CLI
+var vpnPromptTimeout = 10 * time.Second
+
+// vpnSession is a single `vpn -s` process. When the tool prompts over a pipe,
+// status checks are answered interactively and the session is then finished
+// with the connect/disconnect command, so one command of this CLI only pays
+// the Cisco client startup cost once.
+type vpnSession struct {
+	cmd     *exec.Cmd
+	stdin   io.WriteCloser
+	stdout  *bufio.Reader
+	pipe    io.ReadCloser // raw stdout pipe underlying stdout
+	echo    io.Writer     // if set, session output is copied here as it is read
+	tracker vpnStateTracker
+	started bool
+	closed  bool
+}
+
+// newVPNSession prepares `vpn -s` without starting it. In verbose mode both
+// stdout (via echo) and stderr of the tool are shown from the start.
+func newVPNSession(vpnExec string, verbose bool) (*vpnSession, error) {
+	cmd := exec.Command(vpnExec, "-s")
+	stdin, err := cmd.StdinPipe()
+	if err != nil {
+		return nil, err
+	}
+	stdout, err := cmd.StdoutPipe()
+	if err != nil {
+		return nil, err
+	}
+
+	session := &vpnSession{cmd: cmd, stdin: stdin, stdout: bufio.NewReader(stdout), pipe: stdout}
+	if verbose {
+		cmd.Stderr = os.Stderr
+		session.echo = os.Stdout
+	}
+	return session, nil
+}
+
+// start starts the VPN tool if it isn't running yet
+func (v *vpnSession) start() error {
+	if v.started {
+		return nil
+	}
+	v.started = true
+	return v.cmd.Start()
+}
+
+// startVPNSession starts `vpn -s` and waits for its first prompt
+func startVPNSession(vpnExec string, verbose bool) (*vpnSession, error) {
+	session, err := newVPNSession(vpnExec, verbose)
+	if err != nil {
+		return nil, err
+	}
+	if err := session.start(); err != nil {
+		return nil, err
+	}
+	if _, err := session.read(); err != nil {
+		session.close()
+		return nil, err
+	}
+	return session, nil
+}
+
+// openVPNSession returns a session ready to be finished with a command, and
+// whether the VPN is currently connected. The state is checked within the
+// session itself when possible. If the tool doesn't answer interactively
+// (e.g. it buffers its prompt when writing to a pipe), this falls back to
+// vpnConnected and a session that only runs the final script.
+func openVPNSession(vpnExec string, verbose bool) (*vpnSession, bool, error) {
+	session, err := startVPNSession(vpnExec, verbose)
+	if err == nil {
+		state, err := session.state()
+		if err == nil {
+			return session, state == "Connected", nil
+		}
+		session.close()
+	}
+
+	connected := vpnConnected(vpnExec)
+	session, err = newVPNSession(vpnExec, verbose)
+	if err != nil {
+		return nil, false, err
+	}
+	return session, connected, nil
+}
+
+// read consumes session output up to and including the next prompt and
+// returns it. The VPN tool is killed if no prompt arrives within
+// vpnPromptTimeout.
+func (v *vpnSession) read() (string, error) {
+	timer := time.AfterFunc(vpnPromptTimeout, func() {
+		v.cmd.Process.Kill()
+		// Unblock the read even if a child of the tool still holds the pipe
+		v.pipe.Close()
+	})
+	defer timer.Stop()
+
+	var output strings.Builder
+	lineStart := 0
+	for !strings.HasSuffix(output.String(), vpnPrompt) {
+		b, err := v.stdout.ReadByte()
+		if err != nil {
+			if !timer.Stop() {
+				return output.String(), fmt.Errorf("timed out waiting for VPN prompt")
+			}
+			return output.String(), fmt.Errorf("VPN session ended unexpectedly: %v", err)
+		}
+		output.WriteByte(b)
+		if b != '\n' {
+			continue
+		}
+		line := output.String()[lineStart:]
+		lineStart = output.Len()
+		v.tracker.observe(line)
+		if v.echo != nil {
+			io.WriteString(v.echo, line)
+		}
+	}
+	if v.echo != nil {
+		io.WriteString(v.echo, output.String()[lineStart:])
+	}
+	return output.String(), nil
+}
+
+// write writes each part to the session's stdin in order
+func (v *vpnSession) write(parts ...[]byte) error {
+	for _, part := range parts {
+		if _, err := v.stdin.Write(part); err != nil {
+			return err
+		}
+	}
+	return nil
+}
+
+// send writes input to the session and returns the output produced before
+// the next prompt
+func (v *vpnSession) send(input string) (string, error) {
+	if _, err := io.WriteString(v.stdin, input); err != nil {
+		return "", err
+	}
+	return v.read()
+}
+
+// state asks the session for the current VPN state, e.g. "Connected". It
+// follows the same rule as vpnConnected: a state reported before the tool
+// registered with the local VPN subsystem is not accepted.
+func (v *vpnSession) state() (string, error) {
+	v.tracker.current = ""
+	if _, err := v.send("state\n"); err != nil {
+		return "", err
+	}
+	if v.tracker.current == "" {
+		return "", fmt.Errorf("VPN session did not report an authoritative state")
+	}
+	return v.tracker.current, nil
+}
+
+// finish writes the final input to the session followed by "exit", then
+// reads the remaining output until the VPN tool terminates. Since stdin is
+// closed, a prompt the input did not answer (e.g. a repeated login prompt
+// after a wrong password) makes the tool exit instead of waiting forever.
+// The tool is started first if it isn't running yet.
+func (v *vpnSession) finish(parts ...[]byte) (string, error) {
+	if err := v.start(); err != nil {
+		return "", err
+	}
+	v.closed = true
+	err := v.write(append(parts, []byte("exit\n"))...)
+	v.stdin.Close()
+	if err != nil {
+		v.cmd.Process.Kill()
+		v.cmd.Wait()
+		return "", err
+	}
+
+	var stdout io.Reader = v.stdout
+	if v.echo != nil {
+		stdout = io.TeeReader(v.stdout, v.echo)
+	}
+	output, err := io.ReadAll(stdout)
+	if err != nil {
+		v.cmd.Process.Kill()
+		v.cmd.Wait()
+		return string(output), err
+	}
+	return string(output), v.cmd.Wait()
+}
+
+// close exits the session and waits for the VPN tool to terminate. It is
+// safe to call more than once, and on a session that was never started.
+func (v *vpnSession) close() error {
+	if !v.started || v.closed {
+		return nil
+	}
+	v.closed = true
+	io.WriteString(v.stdin, "exit\n")
+	v.stdin.Close()
+	return v.cmd.Wait()
+}
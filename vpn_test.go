@@ -0,0 +1,204 @@
+package main
+
+import (
+	"os"
+	"path/filepath"
+	"runtime"
+	"testing"
+	"time"
+)
+
+// fakeVPNScript imitates the Cisco client's `status` and `-s` modes. Its
+// behaviour is controlled through FAKE_* environment variables.
+const fakeVPNScript = `#!/bin/sh
+if [ "$1" = status ]; then
+	[ -n "$FAKE_EARLY_STATE" ] && echo "  >> state: $FAKE_EARLY_STATE"
+	[ -z "$FAKE_UNREGISTERED" ] && echo "  >> registered with local VPN subsystem."
+	echo "  >> state: $FAKE_STATE"
+	exit ${FAKE_STATUS_EXIT:-0}
+fi
+[ -n "$FAKE_SILENT" ] && exec sleep 60
+echo "Cisco Secure Client"
+[ -z "$FAKE_UNREGISTERED" ] && echo "  >> registered with local VPN subsystem."
+printf "VPN> "
+while read -r cmd; do
+	case "$cmd" in
+	state)
+		echo "  >> state: $FAKE_STATE"
+		printf "VPN> " ;;
+	connect*)
+		while :; do
+			printf "Username: "
+			read -r user || exit 0
+			printf "Password: "
+			read -r pass || exit 0
+			[ "$pass" = good ] && break
+			echo "  >> Login failed."
+		done
+		read -r method
+		read -r accept
+		echo "  >> state: Connected"
+		printf "VPN> " ;;
+	disconnect)
+		echo "  >> state: Disconnected"
+		printf "VPN> " ;;
+	exit)
+		exit 0 ;;
+	*)
+		printf "VPN> " ;;
+	esac
+done
+`
+
+// fakeVPN writes fakeVPNScript to a temporary directory and returns its path
+func fakeVPN(t *testing.T) string {
+	t.Helper()
+	if runtime.GOOS == "windows" {
+		t.Skip("fake VPN tool is a shell script")
+	}
+	path := filepath.Join(t.TempDir(), "vpn")
+	if err := os.WriteFile(path, []byte(fakeVPNScript), 0755); err != nil {
+		t.Fatal(err)
+	}
+	return path
+}
+
+// connectScript returns the connect answers for the given password
+func connectScript(password string) [][]byte {
+	return [][]byte{[]byte("connect vpn.example.com\nuser\n"), []byte(password), []byte("\npush\ny\n")}
+}
+
+func TestLastState(t *testing.T) {
+	tests := []struct {
+		output string
+		want   string
+	}{
+		{"", ""},
+		{"  >> notice: Ready to connect.\nVPN> ", ""},
+		{"  >> state: Connecting\n  >> state: Connected\nVPN> ", "Connected"},
+		{"  >> state: Disconnecting\n  >> state: Disconnected\n", "Disconnected"},
+	}
+	for _, tt := range tests {
+		if got := lastState(tt.output); got != tt.want {
+			t.Errorf("lastState(%q) = %q, want %q", tt.output, got, tt.want)
+		}
+	}
+}
+
+func TestVPNConnected(t *testing.T) {
+	vpn := fakeVPN(t)
+	tests := []struct {
+		name string
+		env  map[string]string
+		want bool
+	}{
+		{"connected", map[string]string{"FAKE_STATE": "Connected"}, true},
+		{"disconnected", map[string]string{"FAKE_STATE": "Disconnected"}, false},
+		{"pre-registration state ignored", map[string]string{"FAKE_EARLY_STATE": "Connected", "FAKE_STATE": "Disconnected"}, false},
+		{"unregistered uses last state", map[string]string{"FAKE_UNREGISTERED": "1", "FAKE_STATE": "Connected"}, true},
+		{"failed status", map[string]string{"FAKE_UNREGISTERED": "1", "FAKE_STATE": "Connected", "FAKE_STATUS_EXIT": "1"}, false},
+	}
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			for k, v := range tt.env {
+				t.Setenv(k, v)
+			}
+			if got := vpnConnected(vpn); got != tt.want {
+				t.Errorf("vpnConnected() = %v, want %v", got, tt.want)
+			}
+		})
+	}
+}
+
+func TestVPNSessionConnect(t *testing.T) {
+	vpn := fakeVPN(t)
+	t.Setenv("FAKE_STATE", "Disconnected")
+
+	session, connected, err := openVPNSession(vpn, false)
+	if err != nil {
+		t.Fatal(err)
+	}
+	defer session.close()
+	if connected {
+		t.Fatal("openVPNSession reported connected")
+	}
+
+	output, err := session.finish(connectScript("good")...)
+	if err != nil {
+		t.Fatal(err)
+	}
+	if got := lastState(output); got != "Connected" {
+		t.Errorf("lastState after connect = %q, want %q", got, "Connected")
+	}
+}
+
+func TestVPNSessionFailedLogin(t *testing.T) {
+	vpn := fakeVPN(t)
+	t.Setenv("FAKE_STATE", "Disconnected")
+
+	session, err := startVPNSession(vpn, false)
+	if err != nil {
+		t.Fatal(err)
+	}
+	defer session.close()
+
+	// The tool asks for the username again after a wrong password; closing
+	// stdin must make it exit rather than hang
+	done := make(chan string)
+	go func() {
+		output, _ := session.finish(connectScript("bad")...)
+		done <- output
+	}()
+	select {
+	case output := <-done:
+		if got := lastState(output); got != "" {
+			t.Errorf("lastState after failed login = %q, want none", got)
+		}
+	case <-time.After(5 * time.Second):
+		t.Fatal("finish hung after a failed login")
+	}
+}
+
+func TestVPNSessionPromptTimeout(t *testing.T) {
+	vpn := fakeVPN(t)
+	t.Setenv("FAKE_SILENT", "1")
+	t.Setenv("FAKE_STATE", "Connected")
+
+	timeout := vpnPromptTimeout
+	vpnPromptTimeout = 100 * time.Millisecond
+	t.Cleanup(func() { vpnPromptTimeout = timeout })
+
+	start := time.Now()
+	if _, err := startVPNSession(vpn, false); err == nil {
+		t.Fatal("startVPNSession succeeded without a prompt")
+	}
+	if elapsed := time.Since(start); elapsed > 5*time.Second {
+		t.Errorf("startVPNSession took %v to time out", elapsed)
+	}
+
+	// openVPNSession falls back to `vpn status` for the pre-check
+	session, connected, err := openVPNSession(vpn, false)
+	if err != nil {
+		t.Fatal(err)
+	}
+	defer session.close()
+	if !connected {
+		t.Error("openVPNSession fallback reported not connected")
+	}
+}
+
+func TestVPNSessionStateBeforeRegistration(t *testing.T) {
+	vpn := fakeVPN(t)
+	t.Setenv("FAKE_UNREGISTERED", "1")
+	t.Setenv("FAKE_STATE", "Connected")
+
+	session, err := startVPNSession(vpn, false)
+	if err != nil {
+		t.Fatal(err)
+	}
+	defer session.close()
+
+	if state, err := session.state(); err == nil {
+		t.Errorf("state() = %q before registration, want an error", state)
+	}
+}